@@ -1,11 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import calculator, backtest, portfolio
-from app.database import engine, Base
+from importlib import import_module
+from dotenv import load_dotenv
 import os
 
-# Create database tables
-# # Base.metadata.create_all(bind=engine)
+# Load .env before reading ENABLED_ROUTERS / FRONTEND_URL below
+load_dotenv()
+
+# Create database tables (engine is created lazily, see app.database.get_engine)
+# # Base.metadata.create_all(bind=get_engine())
 
 app = FastAPI(
     title="Derivatives Greeks Simulator & Backtester",
@@ -29,9 +32,26 @@ app.add_middleware(
 )
 
 # Include routers
-app.include_router(calculator.router, prefix="/api/calculator", tags=["Calculator"])
-app.include_router(backtest.router, prefix="/api/backtest", tags=["Backtest"])
-app.include_router(portfolio.router, prefix="/api/portfolio", tags=["Portfolio"])
+# ENABLED_ROUTERS (e.g. "calculator") limits which routers a worker imports,
+# so workers serving only /greeks skip the backtest and portfolio modules
+ROUTERS = {
+    "calculator": ("/api/calculator", "Calculator"),
+    "backtest": ("/api/backtest", "Backtest"),
+    "portfolio": ("/api/portfolio", "Portfolio"),
+}
+
+enabled_routers = [
+    name.strip()
+    for name in os.getenv("ENABLED_ROUTERS", ",".join(ROUTERS)).split(",")
+    if name.strip()
+]
+
+for name in enabled_routers:
+    if name not in ROUTERS:
+        raise ValueError(f"Unknown router in ENABLED_ROUTERS: {name}")
+    prefix, tag = ROUTERS[name]
+    module = import_module(f"app.routers.{name}")
+    app.include_router(module.router, prefix=prefix, tags=[tag])
 
 @app.get("/health")
 async def health_check():
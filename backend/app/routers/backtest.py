@@ -1,26 +1,27 @@
 from fastapi import APIRouter, HTTPException
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List
+import numpy as np
 from app.schemas import BacktestRequest, BacktestResult
 from app.services.backtester import StrategyBacktester
 
 router = APIRouter()
 
+# Upper bounds for /simulate, which runs synchronously in a worker thread
+MAX_SIMULATION_PATHS = 100_000
+MAX_SIMULATION_DAYS = 3650
+
 @router.post("/strategy")
 async def backtest_strategy(request: BacktestRequest):
     """Backtest an option strategy over historical data"""
     try:
         # Mock historical data - in production, fetch from database
         days = (request.end_date - request.start_date).days
-        dates = [request.start_date + __import__('datetime').timedelta(days=i) for i in range(days)]
+        dates = [request.start_date + timedelta(days=i) for i in range(days)]
         
-        # Generate mock price data with realistic movement
-        price_data = []
-        current_price = 100
-        for _ in range(len(dates)):
-            random_return = __import__('numpy').random.normal(0.0005, 0.02)
-            current_price *= (1 + random_return)
-            price_data.append(current_price)
+        # Generate mock price data with realistic movement (pass "seed" to reproduce)
+        rng = np.random.default_rng(request.parameters.get("seed"))
+        price_data = (100 * np.cumprod(1 + rng.normal(0.0005, 0.02, days))).tolist()
         
         result = StrategyBacktester.backtest_strategy(
             price_data=price_data,
@@ -36,6 +37,40 @@ async def backtest_strategy(request: BacktestRequest):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/simulate")
+def simulate_strategy(request: BacktestRequest):
+    """Backtest a strategy across many Monte Carlo price paths"""
+    # Plain def: FastAPI runs CPU-bound handlers in its threadpool
+    try:
+        params = request.parameters
+        n_paths = int(params.get("n_paths", 1000))
+        days = (request.end_date - request.start_date).days
+        if not 1 <= n_paths <= MAX_SIMULATION_PATHS:
+            raise ValueError(f"n_paths must be between 1 and {MAX_SIMULATION_PATHS}")
+        if not 1 <= days <= MAX_SIMULATION_DAYS:
+            raise ValueError(f"Date range must span 1 to {MAX_SIMULATION_DAYS} days")
+        
+        result = StrategyBacktester.simulate_strategy(
+            S0=params.get("initial_price", 100),
+            start_date=request.start_date,
+            days=days,
+            strike=params.get("strike", 100),
+            expiration=params.get("expiration", request.end_date),
+            strategy_type=request.strategy_type,
+            initial_capital=request.initial_capital,
+            r=params.get("risk_free_rate", 0.05),
+            n_paths=n_paths,
+            model=params.get("model", "gbm"),
+            mu=params.get("mu", 0.05),
+            sigma=params.get("sigma", 0.25),
+            seed=params.get("seed"),
+            heston_params=params.get("heston_params"),
+        )
+        
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/strategies")
 async def list_strategies():
     """List available backtesting strategies"""
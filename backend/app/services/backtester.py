@@ -1,9 +1,11 @@
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List
-import pandas as pd
+from typing import Dict, Iterator, List, Optional
 from .greeks_calculator import BlackScholesCalculator
 
+# Values per (paths x days) array in one simulation chunk (8 bytes each)
+SIMULATION_CHUNK_ELEMENTS = 1_000_000
+
 class StrategyBacktester:
     """Backtest option strategies over historical data"""
     
@@ -91,16 +93,176 @@ class StrategyBacktester:
         }
     
     @staticmethod
-    def _calculate_max_drawdown(equity_curve: np.ndarray) -> float:
-        """Calculate maximum drawdown from equity curve"""
-        running_max = np.maximum.accumulate(equity_curve)
+    def generate_paths(
+        S0: float,
+        days: int,
+        n_paths: int,
+        model: str = "gbm",
+        mu: float = 0.05,
+        sigma: float = 0.25,
+        seed: Optional[int] = None,
+        chunk_paths: Optional[int] = None,
+        heston_params: Optional[Dict] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Yield simulated daily price paths in (paths x days) chunks
+        
+        model: 'gbm' or 'heston'. Column 0 is S0; steps are one calendar day.
+        chunk_paths defaults to SIMULATION_CHUNK_ELEMENTS // days.
+        heston_params: kappa, theta, xi, rho, v0 (variance terms are annual)
+        """
+        if model not in ("gbm", "heston"):
+            raise ValueError(f"Unknown path model: {model}")
+        if days < 1 or n_paths < 1:
+            raise ValueError(f"days and n_paths must be at least 1 (got {days}, {n_paths})")
+        
+        dt = 1 / 365.0
+        rng = np.random.default_rng(seed)
+        params = {"kappa": 2.0, "theta": sigma ** 2, "xi": 0.5, "rho": -0.7, "v0": sigma ** 2}
+        params.update(heston_params or {})
+        
+        chunk_paths = chunk_paths or max(1, SIMULATION_CHUNK_ELEMENTS // days)
+        
+        for start in range(0, n_paths, chunk_paths):
+            n = min(chunk_paths, n_paths - start)
+            
+            # Each path's normals are contiguous in the RNG stream, so results
+            # for a given seed don't depend on chunk_paths. The normals are
+            # turned into log returns in place
+            if model == "gbm":
+                increments = rng.standard_normal((n, days - 1))
+                increments *= sigma * np.sqrt(dt)
+                increments += (mu - 0.5 * sigma ** 2) * dt
+            else:
+                draws = rng.standard_normal((n, 2, days - 1))
+                increments = draws[:, 0]
+                rho_bar = np.sqrt(1 - params["rho"] ** 2)
+                # Euler scheme with full truncation of the variance
+                v = np.full(n, float(params["v0"]))
+                for t in range(days - 1):
+                    v_pos = np.maximum(v, 0.0)
+                    z_v = params["rho"] * increments[:, t] + rho_bar * draws[:, 1, t]
+                    increments[:, t] = ((mu - 0.5 * v_pos) * dt
+                                        + np.sqrt(v_pos * dt) * increments[:, t])
+                    v = (v + params["kappa"] * (params["theta"] - v_pos) * dt
+                         + params["xi"] * np.sqrt(v_pos * dt) * z_v)
+            
+            paths = np.empty((n, days))
+            paths[:, 0] = 0.0
+            np.cumsum(increments, axis=1, out=paths[:, 1:])
+            del increments
+            np.exp(paths, out=paths)
+            paths *= S0
+            yield paths
+    
+    @staticmethod
+    def simulate_strategy(
+        S0: float,
+        start_date: datetime,
+        days: int,
+        strike: float,
+        expiration: datetime,
+        strategy_type: str,
+        initial_capital: float,
+        r: float,
+        n_paths: int = 1000,
+        model: str = "gbm",
+        mu: float = 0.05,
+        sigma: float = 0.25,
+        seed: Optional[int] = None,
+        chunk_elements: int = SIMULATION_CHUNK_ELEMENTS,
+        heston_params: Optional[Dict] = None,
+        pricing_vol: float = 0.25
+    ) -> Dict:
+        """
+        Backtest a long call or put across many simulated price paths
+        
+        Buys one option on the first day and marks it to model daily, like
+        backtest_strategy. Unlike backtest_strategy, which opens calls only and
+        subtracts the premium again at expiration, the option is settled at
+        intrinsic value on expiration, so results match it only for paths
+        that end before expiry.
+        Returns the distribution of total return, max drawdown and Sharpe.
+        
+        Paths are simulated in chunks of about chunk_elements path-days, so
+        memory does not grow with n_paths or the length of the range.
+        """
+        if strategy_type not in ("call", "put"):
+            raise ValueError(f"Strategy not supported in simulation mode: {strategy_type}")
+        if days < 1 or n_paths < 1:
+            raise ValueError(f"days and n_paths must be at least 1 (got {days}, {n_paths})")
+        
+        dates = [start_date + timedelta(days=i) for i in range(days)]
+        T = np.array([(expiration - date).days / 365.0 for date in dates])
+        # Like backtest_strategy, stop after the first day on or past expiration
+        expired_days = np.flatnonzero(T <= 0)
+        live_days = int(expired_days[0]) + 1 if len(expired_days) else days
+        T = T[:live_days]
+        
+        chunk_paths = max(1, chunk_elements // live_days)
+        total_returns, max_drawdowns, sharpe_ratios = [], [], []
+        
+        for paths in StrategyBacktester.generate_paths(
+            S0, live_days, n_paths, model, mu, sigma, seed, chunk_paths, heston_params
+        ):
+            equity = BlackScholesCalculator.calculate_greeks_batch(
+                paths, strike, np.maximum(T, 1e-6), r, pricing_vol, strategy_type,
+                price_only=True
+            )["price"]
+            if T[-1] <= 0:
+                payoff = paths[:, -1] - strike if strategy_type == "call" else strike - paths[:, -1]
+                equity[:, -1] = np.maximum(payoff, 0.0)
+            
+            # Same accounting as backtest_strategy: equity = capital + value - cost,
+            # turned into equity in place
+            equity -= equity[:, 0].copy()[:, np.newaxis]
+            equity += initial_capital
+            # backtest_strategy's curve starts with an extra initial_capital
+            # point, which adds a leading zero return
+            returns = np.empty_like(equity)
+            returns[:, 0] = 0.0
+            np.subtract(equity[:, 1:], equity[:, :-1], out=returns[:, 1:])
+            returns[:, 1:] /= equity[:, :-1]
+            
+            total_returns.append((equity[:, -1] - initial_capital) / initial_capital)
+            max_drawdowns.append(StrategyBacktester._calculate_max_drawdown(equity, axis=1))
+            sharpe_ratios.append(StrategyBacktester._calculate_sharpe(returns, axis=1))
+            del equity, returns
+        
+        return {
+            "n_paths": n_paths,
+            "model": model,
+            "days": live_days,
+            "total_return": StrategyBacktester._summarize(np.concatenate(total_returns)),
+            "max_drawdown": StrategyBacktester._summarize(np.concatenate(max_drawdowns)),
+            "sharpe_ratio": StrategyBacktester._summarize(np.concatenate(sharpe_ratios)),
+            "probability_of_loss": float(np.mean(np.concatenate(total_returns) < 0)),
+        }
+    
+    @staticmethod
+    def _summarize(values: np.ndarray) -> Dict:
+        """Mean, standard deviation and percentiles of a per-path metric"""
+        percentiles = np.percentile(values, [5, 25, 50, 75, 95])
+        return {
+            "mean": float(np.mean(values)),
+            "std": float(np.std(values)),
+            **{f"p{p}": float(v) for p, v in zip((5, 25, 50, 75, 95), percentiles)},
+        }
+    
+    @staticmethod
+    def _calculate_max_drawdown(equity_curve: np.ndarray, axis: Optional[int] = None):
+        """Calculate maximum drawdown from equity curve (per row when axis=1)"""
+        running_max = np.maximum.accumulate(equity_curve, axis=-1)
         drawdown = (equity_curve - running_max) / running_max
-        return float(np.min(drawdown))
+        if axis is None:
+            return float(np.min(drawdown))
+        return np.min(drawdown, axis=axis)
     
     @staticmethod
-    def _calculate_sharpe(returns: np.ndarray, rf_rate: float = 0.02) -> float:
-        """Calculate Sharpe ratio"""
-        if len(returns) == 0:
-            return 0
+    def _calculate_sharpe(returns: np.ndarray, rf_rate: float = 0.02, axis: Optional[int] = None):
+        """Calculate Sharpe ratio (per row when axis=1)"""
+        if returns.shape[-1] == 0:
+            return 0 if axis is None else np.zeros(returns.shape[0])
         excess_returns = returns - (rf_rate / 252)
-        return float(np.mean(excess_returns) / (np.std(excess_returns) + 1e-10) * np.sqrt(252))
+        sharpe = np.mean(excess_returns, axis=axis) / (np.std(excess_returns, axis=axis) + 1e-10) * np.sqrt(252)
+        return float(sharpe) if axis is None else sharpe
@@ -69,6 +69,23 @@ class BlackScholesCalculator:
             "price": float(price),
         }
     
+    @staticmethod
+    def calculate_greeks_batch(
+        S,  # underlying prices
+        K,  # strike prices
+        T,  # times to expiration (years)
+        r,  # risk-free rates
+        sigma,  # volatilities
+        option_type,  # 'call'/'put' or an array of them
+        q=0.0,  # dividend yields
+        price_only: bool = False  # skip the Greeks, return only "price"
+    ) -> Dict[str, np.ndarray]:
+        """Calculate Greeks for arrays of contracts (see pricing_kernels)"""
+        # Imported here so workers that never batch don't pay for Numba/SciPy
+        from .pricing_kernels import calculate_greeks_batch
+        
+        return calculate_greeks_batch(S, K, T, r, sigma, option_type, q, price_only)
+    
     @staticmethod
     def calculate_pnl_surface(
         S: float,
@@ -97,16 +114,12 @@ class BlackScholesCalculator:
         initial_price = initial_greeks["price"]
         initial_delta = initial_greeks["delta"]
         
-        # Create surface
-        pnl_surface = np.zeros((len(iv_levels), len(underlying_prices)))
-        
-        for i, iv in enumerate(iv_levels):
-            for j, price in enumerate(underlying_prices):
-                greeks = BlackScholesCalculator.calculate_greeks(
-                    price, K, T, r, iv, option_type
-                )
-                # Simplified P&L: new price - initial price
-                pnl_surface[i, j] = greeks["price"] - initial_price
+        # Create surface: rows are IV levels, columns are underlying prices
+        surface_greeks = BlackScholesCalculator.calculate_greeks_batch(
+            underlying_prices[np.newaxis, :], K, T, r, iv_levels[:, np.newaxis], option_type
+        )
+        # Simplified P&L: new price - initial price
+        pnl_surface = surface_greeks["price"] - initial_price
         
         return {
             "underlying_prices": underlying_prices.tolist(),
@@ -0,0 +1,152 @@
+"""
+Daily P&L explain for an option portfolio
+
+Splits each day's mark-to-model P&L into delta, gamma, vega, theta and rho
+terms from the previous day's Black-Scholes Greeks, with the remainder as
+unexplained. Greeks are computed as (dates x positions) arrays, a chunk of
+dates at a time, so long histories stream with bounded memory.
+"""
+import numpy as np
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence
+from .greeks_calculator import BlackScholesCalculator
+
+COMPONENTS = ("delta", "gamma", "vega", "theta", "rho")
+
+
+def load_closes(db, tickers: Sequence[str], start_date: datetime, end_date: datetime) -> Dict:
+    """
+    Load HistoricalData closes as a (dates x tickers) array
+
+    Only dates where every ticker has a close are kept.
+    """
+    from app.models.database_models import HistoricalData
+
+    rows = (
+        db.query(HistoricalData.date, HistoricalData.ticker, HistoricalData.close)
+        .filter(HistoricalData.ticker.in_(list(tickers)))
+        .filter(HistoricalData.date >= start_date, HistoricalData.date <= end_date)
+        .all()
+    )
+
+    ticker_index = {ticker: i for i, ticker in enumerate(tickers)}
+    dates = sorted({date for date, _, _ in rows})
+    date_index = {date: i for i, date in enumerate(dates)}
+
+    closes = np.full((len(dates), len(tickers)), np.nan)
+    for date, ticker, close in rows:
+        closes[date_index[date], ticker_index[ticker]] = close
+
+    complete = ~np.isnan(closes).any(axis=1)
+    dates = [date for date, keep in zip(dates, complete) if keep]
+    return {"dates": dates, "tickers": list(tickers), "closes": closes[complete]}
+
+
+class PnLAttribution:
+    """Greeks-based P&L explain over a date range"""
+
+    @staticmethod
+    def _values_and_greeks(S, K, T, r, sigma, option_type) -> Dict[str, np.ndarray]:
+        """
+        Batch Greeks; expired options are worth intrinsic value with zero Greeks
+
+        iter_explain only uses the intrinsic value on the expiration day
+        itself; later days are excluded there.
+        """
+        expired = T <= 0
+        greeks = BlackScholesCalculator.calculate_greeks_batch(
+            S, K, np.where(expired, 1.0, T), r, sigma, option_type
+        )
+        if expired.any():
+            intrinsic = np.where(
+                np.asarray(option_type) == "call", np.maximum(S - K, 0), np.maximum(K - S, 0)
+            )
+            for name in greeks:
+                greeks[name] = np.where(expired, 0.0, greeks[name])
+            greeks["price"] = np.where(expired, intrinsic, greeks["price"])
+        return greeks
+
+    @staticmethod
+    def iter_explain(
+        dates: List[datetime],
+        closes: np.ndarray,
+        tickers: Sequence[str],
+        positions: List[Dict],
+        r=0.05,
+        volatilities: Optional[np.ndarray] = None,
+        chunk_days: int = 64,
+    ) -> Iterator[Dict]:
+        """
+        Yield the portfolio P&L explain for each day after the first
+
+        closes: (dates x tickers) underlying closes
+        positions: dicts with ticker, strike, option_type, quantity,
+            expiration (datetime) and volatility
+        r: risk-free rate, scalar or one per date
+        volatilities: optional (dates x positions) implied vols; defaults to
+            each position's constant volatility, which makes vega P&L zero
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        ticker_index = {ticker: i for i, ticker in enumerate(tickers)}
+        columns = np.array([ticker_index[p["ticker"]] for p in positions], dtype=np.int64)
+        K = np.array([p["strike"] for p in positions], dtype=np.float64)
+        option_type = np.array([p["option_type"].lower() for p in positions])
+        quantity = np.array([p.get("quantity", 1) for p in positions], dtype=np.float64)
+        expiration = np.array([p["expiration"] for p in positions], dtype="datetime64[D]")
+
+        day = np.array(dates, dtype="datetime64[D]")
+        rates = np.broadcast_to(np.asarray(r, dtype=np.float64), (len(dates),))
+        if volatilities is None:
+            sigma = np.array([p["volatility"] for p in positions], dtype=np.float64)
+            volatilities = np.broadcast_to(sigma, (len(dates), len(positions)))
+
+        # Consecutive chunks overlap by one date: the last row of one chunk is
+        # the first row (the "previous day") of the next
+        for start in range(0, len(dates) - 1, chunk_days):
+            rows = slice(start, min(start + chunk_days, len(dates) - 1) + 1)
+            S = closes[rows][:, columns]
+            T = (expiration - day[rows, np.newaxis]).astype(np.float64) / 365.0
+            rate = rates[rows, np.newaxis]
+            sigma = volatilities[rows]
+
+            greeks = PnLAttribution._values_and_greeks(S, K, T, rate, sigma, option_type)
+            elapsed = np.diff(day[rows]).astype(np.float64)[:, np.newaxis]
+            dS = np.diff(S, axis=0)
+
+            # A position settles at intrinsic on its first expired day and has
+            # no P&L afterwards
+            live = T[:-1] > 0
+            # Greeks are per unit; vega and rho are per 1%, theta per calendar day
+            pnl = {
+                "actual": np.where(live, np.diff(greeks["price"], axis=0), 0.0),
+                "delta": greeks["delta"][:-1] * dS,
+                "gamma": 0.5 * greeks["gamma"][:-1] * dS * dS,
+                "vega": greeks["vega"][:-1] * np.diff(sigma, axis=0) * 100,
+                "theta": greeks["theta"][:-1] * elapsed,
+                "rho": greeks["rho"][:-1] * np.diff(rate, axis=0) * 100,
+            }
+            totals = {name: values @ quantity for name, values in pnl.items()}
+            totals["unexplained"] = totals["actual"] - sum(totals[name] for name in COMPONENTS)
+
+            for i, date in enumerate(dates[rows][1:]):
+                yield {"date": date, **{name: float(values[i]) for name, values in totals.items()}}
+
+    @staticmethod
+    def explain(
+        dates: List[datetime],
+        closes: np.ndarray,
+        tickers: Sequence[str],
+        positions: List[Dict],
+        r=0.05,
+        volatilities: Optional[np.ndarray] = None,
+        chunk_days: int = 64,
+    ) -> Dict:
+        """Collect iter_explain into a daily series plus range totals"""
+        daily = list(PnLAttribution.iter_explain(
+            dates, closes, tickers, positions, r, volatilities, chunk_days
+        ))
+        names = ("actual",) + COMPONENTS + ("unexplained",)
+        return {
+            "daily": daily,
+            "totals": {name: sum(d[name] for d in daily) for name in names},
+        }
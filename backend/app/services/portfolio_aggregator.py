@@ -69,6 +69,24 @@ class PortfolioAggregator:
             "positions": position_details,
         }
     
+    @staticmethod
+    def calculate_sharded_risk(
+        positions: List[Dict],
+        price_shocks: List[float],
+        iv_shocks: List[float],
+        days_forward: int = 1,
+        workers: int = None
+    ) -> Dict:
+        """
+        Calculate Greeks and scenario P&L for very large books on a process pool
+        
+        Positions are partitioned by underlying; results are reduced into
+        book, underlying and ticker totals (see sharded_risk)
+        """
+        from .sharded_risk import calculate_sharded_risk
+        
+        return calculate_sharded_risk(positions, price_shocks, iv_shocks, days_forward, workers)
+    
     @staticmethod
     def calculate_hedge_ratio(portfolio_greeks: Dict, target_greek: str = "delta") -> Dict:
         """Calculate hedge ratios to neutralize a specific Greek"""
@@ -0,0 +1,218 @@
+"""
+Array kernels for Black-Scholes pricing
+
+Uses Numba when installed: every Greek is computed in a single fused loop,
+so d1, d2 and the discount factors never exist as full-size arrays. The
+loops are single-threaded: Numba's default parallel backend hangs the
+process at exit when first used from a non-main thread, which is where
+FastAPI runs sync handlers. Use sharded_risk for multi-core work.
+Without Numba, falls back to NumPy/SciPy ufuncs evaluated in fixed-size
+blocks, which keeps temporaries bounded by CHUNK_SIZE instead of the batch.
+
+Kernels take 2-D strided views, so inputs broadcast along either axis
+(a per-day T against (paths x days) prices, say) are never copied to full
+size. Degenerate contracts (T=0, sigma=0) give NaN/inf on both backends,
+as the scalar calculate_greeks does.
+"""
+import numpy as np
+from math import sqrt, exp, log, erf, pi
+from typing import Dict
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    numba = None
+    HAS_NUMBA = False
+
+GREEK_NAMES = ("price", "delta", "gamma", "vega", "rho", "theta")
+
+# Elements per chunk for the NumPy fallback
+CHUNK_SIZE = 65536
+
+_INV_SQRT_2PI = 1.0 / sqrt(2.0 * pi)
+
+
+def _norm_cdf_scalar(x):
+    return 0.5 * (1.0 + erf(x / sqrt(2.0)))
+
+
+def _norm_pdf_scalar(x):
+    return exp(-0.5 * x * x) * _INV_SQRT_2PI
+
+
+def _greeks_scalar(S, K, T, r, sigma, q, w):
+    """All Greeks for one contract; w is +1 for calls, -1 for puts"""
+    sqrt_t = sqrt(T)
+    vol_sqrt_t = sigma * sqrt_t
+    d1 = (log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+
+    df_q = exp(-q * T)
+    s_df_q = S * df_q
+    k_df_r = K * exp(-r * T)
+    pdf_d1 = _norm_pdf_scalar(d1)
+    n1 = _norm_cdf_scalar(w * d1)
+    n2 = _norm_cdf_scalar(w * d2)
+
+    price = w * (s_df_q * n1 - k_df_r * n2)
+    delta = w * df_q * n1
+    gamma = df_q * pdf_d1 / (S * vol_sqrt_t)
+    vega = s_df_q * pdf_d1 * sqrt_t / 100
+    rho = w * k_df_r * T * n2 / 100
+    theta = (-s_df_q * pdf_d1 * sigma / (2 * sqrt_t)
+             - w * r * k_df_r * n2
+             + w * q * s_df_q * n1) / 365
+    return price, delta, gamma, vega, rho, theta
+
+
+def _price_scalar(S, K, T, r, sigma, q, w):
+    """Price only, for callers that don't need the Greeks"""
+    vol_sqrt_t = sigma * sqrt(T)
+    d1 = (log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+    return w * (S * exp(-q * T) * _norm_cdf_scalar(w * d1)
+                - K * exp(-r * T) * _norm_cdf_scalar(w * d2))
+
+
+if HAS_NUMBA:
+    # error_model="numpy": division by zero gives inf/NaN instead of raising
+    _jit = numba.njit(cache=True, error_model="numpy")
+    _norm_cdf_scalar = _jit(_norm_cdf_scalar)
+    _norm_pdf_scalar = _jit(_norm_pdf_scalar)
+    _greeks_scalar = _jit(_greeks_scalar)
+    _price_scalar = _jit(_price_scalar)
+
+    @numba.vectorize(["float64(float64)"], cache=True)
+    def _norm_cdf_ufunc(x):
+        return _norm_cdf_scalar(x)
+
+    @numba.vectorize(["float64(float64)"], cache=True)
+    def _norm_pdf_ufunc(x):
+        return _norm_pdf_scalar(x)
+
+    @numba.njit(cache=True, error_model="numpy")
+    def _greeks_fused(S, K, T, r, sigma, q, w, out):
+        rows, cols = S.shape
+        for i in range(rows * cols):
+            a, b = i // cols, i % cols
+            greeks = _greeks_scalar(
+                S[a, b], K[a, b], T[a, b], r[a, b], sigma[a, b], q[a, b], w[a, b]
+            )
+            for j in range(6):
+                out[j, a, b] = greeks[j]
+
+    @numba.njit(cache=True, error_model="numpy")
+    def _price_fused(S, K, T, r, sigma, q, w, out):
+        rows, cols = S.shape
+        for i in range(rows * cols):
+            a, b = i // cols, i % cols
+            out[0, a, b] = _price_scalar(
+                S[a, b], K[a, b], T[a, b], r[a, b], sigma[a, b], q[a, b], w[a, b]
+            )
+
+
+def norm_cdf(x) -> np.ndarray:
+    """Standard normal CDF over an array"""
+    if HAS_NUMBA:
+        return _norm_cdf_ufunc(np.asarray(x, dtype=np.float64))
+    from scipy.special import ndtr
+    return ndtr(x)
+
+
+def norm_pdf(x) -> np.ndarray:
+    """Standard normal PDF over an array"""
+    if HAS_NUMBA:
+        return _norm_pdf_ufunc(np.asarray(x, dtype=np.float64))
+    x = np.asarray(x, dtype=np.float64)
+    return np.exp(-0.5 * x * x) * _INV_SQRT_2PI
+
+
+def _greeks_chunked(S, K, T, r, sigma, q, w, out, price_only=False):
+    """NumPy fallback: same formulas as _greeks_scalar, one block at a time"""
+    from scipy.special import ndtr
+
+    rows, cols = S.shape
+    col_step = min(cols, CHUNK_SIZE)
+    row_step = max(1, CHUNK_SIZE // col_step)
+    for row in range(0, rows, row_step):
+        for col in range(0, cols, col_step):
+            block = (slice(row, row + row_step), slice(col, col + col_step))
+            s, k, t, rr, v, qq, ww = (a[block] for a in (S, K, T, r, sigma, q, w))
+
+            sqrt_t = np.sqrt(t)
+            vol_sqrt_t = v * sqrt_t
+            d1 = np.log(s / k)
+            d1 += (rr - qq + 0.5 * v * v) * t
+            d1 /= vol_sqrt_t
+            d2 = d1 - vol_sqrt_t
+
+            df_q = np.exp(-qq * t)
+            s_df_q = s * df_q
+            k_df_r = k * np.exp(-rr * t)
+            n1 = ndtr(ww * d1)
+            n2 = ndtr(ww * d2)
+
+            out[(0,) + block] = ww * (s_df_q * n1 - k_df_r * n2)
+            if price_only:
+                continue
+
+            pdf_d1 = np.exp(-0.5 * d1 * d1) * _INV_SQRT_2PI
+            out[(1,) + block] = ww * df_q * n1
+            out[(2,) + block] = df_q * pdf_d1 / (s * vol_sqrt_t)
+            out[(3,) + block] = s_df_q * pdf_d1 * sqrt_t / 100
+            out[(4,) + block] = ww * k_df_r * t * n2 / 100
+            out[(5,) + block] = (-s_df_q * pdf_d1 * v / (2 * sqrt_t)
+                                 - ww * rr * k_df_r * n2
+                                 + ww * qq * s_df_q * n1) / 365
+
+
+def option_sign(option_type) -> np.ndarray:
+    """Map 'call'/'put' (scalar or array) to +1.0/-1.0"""
+    option_type = np.asarray(option_type, dtype=str)
+    is_call = option_type == "call"
+    # Lowercasing a large string array is slow, so only do it when needed
+    if not np.all(is_call | (option_type == "put")):
+        is_call = np.char.lower(option_type) == "call"
+    return np.where(is_call, 1.0, -1.0)
+
+
+def calculate_greeks_batch(
+    S, K, T, r, sigma, option_type, q=0.0, price_only=False
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate Black-Scholes price and Greeks for many contracts at once
+
+    Inputs are broadcast against each other; option_type is 'call'/'put'
+    or an array of them. Returns arrays keyed like calculate_greeks, or
+    only "price" when price_only is set.
+    """
+    arrays = [
+        np.asarray(S, dtype=np.float64),
+        np.asarray(K, dtype=np.float64),
+        np.asarray(T, dtype=np.float64),
+        np.asarray(r, dtype=np.float64),
+        np.asarray(sigma, dtype=np.float64),
+        np.asarray(q, dtype=np.float64),
+        option_sign(option_type),
+    ]
+    shape = np.broadcast_shapes(*(a.shape for a in arrays))
+    # Pad to at least 2-D; broadcast_to returns zero-stride views, so inputs
+    # broadcast along an axis are never copied
+    shape_2d = (1,) * max(0, 2 - len(shape)) + shape
+    views = [np.broadcast_to(a, shape_2d) for a in arrays]
+
+    names = ("price",) if price_only else GREEK_NAMES
+    out = np.empty((len(names),) + shape_2d, dtype=np.float64)
+    # Kernels work on 2-D blocks; leading axes beyond two are looped here
+    for index in np.ndindex(shape_2d[:-2]):
+        block_out = out[(slice(None),) + index]
+        block_views = [v[index] for v in views]
+        if HAS_NUMBA:
+            kernel = _price_fused if price_only else _greeks_fused
+            kernel(*block_views, block_out)
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                _greeks_chunked(*block_views, block_out, price_only)
+
+    return {name: out[i].reshape(shape) for i, name in enumerate(names)}
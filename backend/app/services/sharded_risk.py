@@ -0,0 +1,200 @@
+"""
+Sharded portfolio risk across a process pool
+
+Positions are sorted by underlying and split into contiguous shards at
+underlying boundaries. Market data goes into one shared-memory block that
+every worker maps, so only shard bounds and small per-ticker results are
+pickled. Workers return per-ticker Greeks and scenario P&L, and the parent
+reduces them into ticker, underlying and book totals.
+"""
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Dict, List, Optional, Tuple
+from .greeks_calculator import BlackScholesCalculator
+
+# Rows of the shared market data block
+COLUMNS = ("S", "K", "T", "r", "sigma", "sign", "quantity", "ticker_id")
+GREEKS = ("delta", "gamma", "vega", "rho", "theta", "price")
+
+
+def _split_shards(underlying_ids: np.ndarray, shard_count: int) -> List[Tuple[int, int]]:
+    """Split sorted positions into about equal slices without splitting an underlying"""
+    n = len(underlying_ids)
+    # Index where each underlying's run of positions starts
+    starts = np.flatnonzero(np.r_[True, underlying_ids[1:] != underlying_ids[:-1]])
+    bounds = [0]
+    for shard in range(1, shard_count):
+        target = n * shard / shard_count
+        cut = int(starts[np.searchsorted(starts, target)]) if target <= starts[-1] else n
+        if cut > bounds[-1]:
+            bounds.append(cut)
+    if bounds[-1] < n:
+        bounds.append(n)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _init_worker():
+    """Give each worker one Numba thread; the pool already uses every core"""
+    from . import pricing_kernels
+
+    if pricing_kernels.HAS_NUMBA:
+        pricing_kernels.numba.set_num_threads(1)
+
+
+def _shard_risk(
+    shm_name: str,
+    shape: Tuple[int, int],
+    start: int,
+    end: int,
+    price_shocks: np.ndarray,
+    iv_shocks: np.ndarray,
+    days_forward: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Greeks and scenario P&L for one shard, summed per ticker"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)[:, start:end]
+        S, K, T, r, sigma, sign, quantity, ticker_id = data
+        option_type = np.where(sign > 0, "call", "put")
+
+        tickers, local_ids = np.unique(ticker_id.astype(np.int64), return_inverse=True)
+
+        def per_ticker(values):
+            return np.bincount(local_ids, weights=values, minlength=len(tickers))
+
+        greeks = BlackScholesCalculator.calculate_greeks_batch(S, K, T, r, sigma, option_type)
+        ticker_greeks = np.array([per_ticker(greeks[name] * quantity) for name in GREEKS])
+
+        # Same shock rules as ScenarioEngine; one price shock at a time bounds
+        # the temporaries to (IV shocks x positions)
+        T_new = np.maximum(T - days_forward / 365, 0.001)
+        shocked_sigma = np.maximum(sigma * (1 + iv_shocks[:, np.newaxis]), 0.01)
+        ticker_pnl = []
+        for price_shock in price_shocks:
+            shocked = BlackScholesCalculator.calculate_greeks_batch(
+                S * (1 + price_shock), K, T_new, r, shocked_sigma, option_type
+            )
+            for pnl in (shocked["price"] - greeks["price"]) * quantity:
+                ticker_pnl.append(per_ticker(pnl))
+        ticker_pnl = np.array(ticker_pnl).reshape(-1, len(tickers))
+
+        return tickers, ticker_greeks, ticker_pnl
+    finally:
+        shm.close()
+
+
+def _totals(greeks: np.ndarray, pnl: np.ndarray) -> Dict:
+    result = {f"total_{name}": float(greeks[i]) for i, name in enumerate(GREEKS)}
+    result["scenario_pnl"] = pnl.tolist()
+    return result
+
+
+def calculate_sharded_risk(
+    positions: List[Dict],
+    price_shocks: List[float],
+    iv_shocks: List[float],
+    days_forward: int = 1,
+    workers: Optional[int] = None,
+) -> Dict:
+    """
+    Calculate Greeks and scenario P&L for a large book on a worker pool
+
+    positions use the same keys as PortfolioAggregator.calculate_portfolio_greeks,
+    plus an optional "underlying" (defaults to the ticker). scenario_pnl lists
+    follow the order of the "scenarios" grid.
+
+    With more than one shard, workers are started with spawn, so scripts that
+    call this must do so under an `if __name__ == "__main__":` guard.
+    """
+    tickers = sorted({p["ticker"] for p in positions})
+    ticker_underlying = {p["ticker"]: p.get("underlying", p["ticker"]) for p in positions}
+    underlyings = sorted(set(ticker_underlying.values()))
+    ticker_index = {t: i for i, t in enumerate(tickers)}
+    underlying_index = {u: i for i, u in enumerate(underlyings)}
+
+    price_shocks = np.asarray(price_shocks, dtype=np.float64)
+    iv_shocks = np.asarray(iv_shocks, dtype=np.float64)
+    scenario_count = len(price_shocks) * len(iv_shocks)
+
+    book_greeks = np.zeros(len(GREEKS))
+    book_pnl = np.zeros(scenario_count)
+    ticker_greeks = np.zeros((len(GREEKS), len(tickers)))
+    ticker_pnl = np.zeros((scenario_count, len(tickers)))
+    shards = []
+
+    if positions:
+        ordered = sorted(
+            positions,
+            key=lambda p: (underlying_index[ticker_underlying[p["ticker"]]], p["ticker"]),
+        )
+        shape = (len(COLUMNS), len(ordered))
+        shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+        try:
+            data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+            data[0] = [p["underlying_price"] for p in ordered]
+            data[1] = [p["strike"] for p in ordered]
+            data[2] = [p["time_to_expiration"] for p in ordered]
+            data[3] = [p["risk_free_rate"] for p in ordered]
+            data[4] = [p["volatility"] for p in ordered]
+            data[5] = [1.0 if p["option_type"].lower() == "call" else -1.0 for p in ordered]
+            data[6] = [p.get("quantity", 1) for p in ordered]
+            data[7] = [ticker_index[p["ticker"]] for p in ordered]
+
+            underlying_ids = np.array(
+                [underlying_index[ticker_underlying[p["ticker"]]] for p in ordered]
+            )
+            workers = workers or os.cpu_count() or 1
+            shards = _split_shards(underlying_ids, workers)
+            args = [
+                (shm.name, shape, start, end, price_shocks, iv_shocks, days_forward)
+                for start, end in shards
+            ]
+
+            if len(shards) == 1:
+                results = [_shard_risk(*args[0])]
+            else:
+                # spawn, not fork: the Numba thread pool and server threads are not fork-safe
+                with ProcessPoolExecutor(
+                    max_workers=len(shards),
+                    mp_context=get_context("spawn"),
+                    initializer=_init_worker,
+                ) as pool:
+                    results = list(pool.map(_shard_risk, *zip(*args)))
+        finally:
+            shm.close()
+            shm.unlink()
+
+        # Shards never split an underlying, so each ticker comes from one shard
+        for shard_tickers, greeks, pnl in results:
+            ticker_greeks[:, shard_tickers] += greeks
+            ticker_pnl[:, shard_tickers] += pnl
+        book_greeks = ticker_greeks.sum(axis=1)
+        book_pnl = ticker_pnl.sum(axis=1)
+
+    underlying_ids = np.array([underlying_index[ticker_underlying[t]] for t in tickers],
+                              dtype=np.int64)
+    underlying_greeks = np.zeros((len(GREEKS), len(underlyings)))
+    underlying_pnl = np.zeros((scenario_count, len(underlyings)))
+    np.add.at(underlying_greeks.T, underlying_ids, ticker_greeks.T)
+    np.add.at(underlying_pnl.T, underlying_ids, ticker_pnl.T)
+
+    return {
+        **_totals(book_greeks, book_pnl),
+        "position_count": len(positions),
+        "shard_count": len(shards),
+        "scenarios": [
+            {"price_shock": price_shock * 100, "iv_shock": iv_shock * 100}
+            for price_shock in price_shocks.tolist()
+            for iv_shock in iv_shocks.tolist()
+        ],
+        "underlyings": {
+            u: _totals(underlying_greeks[:, i], underlying_pnl[:, i])
+            for i, u in enumerate(underlyings)
+        },
+        "tickers": {
+            t: {"underlying": ticker_underlying[t], **_totals(ticker_greeks[:, i], ticker_pnl[:, i])}
+            for i, t in enumerate(tickers)
+        },
+    }
@@ -0,0 +1,90 @@
+"""
+Check and time the batch pricing kernels
+
+First compares calculate_greeks_batch against the scalar calculate_greeks
+on random contracts plus degenerate ones with T=0 or sigma=0 (exits
+non-zero on mismatch), then times a large batch.
+
+Usage:
+    python benchmark_kernels.py [--contracts 1000000] [--runs 3]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from app.services import pricing_kernels
+from app.services.greeks_calculator import BlackScholesCalculator
+
+PARITY_CONTRACTS = 2000
+TOLERANCE = 1e-9
+
+# Contracts overwritten with T=0, sigma=0 and both; NaN/inf must match too
+DEGENERATE = {0: {"T": 0.0}, 1: {"sigma": 0.0}, 2: {"T": 0.0, "sigma": 0.0}, 3: {"T": 0.0}}
+
+
+def random_contracts(n: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        "S": rng.uniform(50, 150, n),
+        "K": rng.uniform(50, 150, n),
+        "T": rng.uniform(0.01, 2.0, n),
+        "r": rng.uniform(0.0, 0.08, n),
+        "sigma": rng.uniform(0.05, 0.8, n),
+        "option_type": rng.choice(["call", "put"], n),
+        "q": rng.uniform(0.0, 0.04, n),
+    }
+
+
+def check_parity() -> float:
+    """Return the largest absolute difference between batch and scalar Greeks"""
+    contracts = random_contracts(PARITY_CONTRACTS)
+    for i, overrides in DEGENERATE.items():
+        for key, value in overrides.items():
+            contracts[key][i] = value
+    # At-the-money with T=0 gives 0/0 (NaN) rather than +-inf
+    contracts["K"][3] = contracts["S"][3]
+    batch = BlackScholesCalculator.calculate_greeks_batch(**contracts)
+
+    worst = 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i in range(PARITY_CONTRACTS):
+            scalar = BlackScholesCalculator.calculate_greeks(
+                **{key: values[i] for key, values in contracts.items()}
+            )
+            for name in pricing_kernels.GREEK_NAMES:
+                a, b = batch[name][i], scalar[name]
+                if a == b or (np.isnan(a) and np.isnan(b)):
+                    continue
+                worst = max(worst, abs(a - b) if np.isfinite(a - b) else np.inf)
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contracts", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    backend = "numba" if pricing_kernels.HAS_NUMBA else "numpy"
+    worst = check_parity()
+    print(f"parity ({backend}): max abs diff {worst:.3e} over {PARITY_CONTRACTS} contracts")
+    if worst > TOLERANCE:
+        print(f"FAILED: exceeds tolerance {TOLERANCE:.0e}")
+        sys.exit(1)
+
+    contracts = random_contracts(args.contracts, seed=1)
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        BlackScholesCalculator.calculate_greeks_batch(**contracts)
+        timings.append(time.perf_counter() - start)
+    print(
+        f"batch ({backend}): {args.contracts} contracts, "
+        f"best {min(timings) * 1000:.1f} ms ({args.runs} runs)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measure cold-start time of the API
+
+Each run imports app.main in a fresh interpreter, so module caches from
+previous runs don't hide import cost.
+
+Usage:
+    python benchmark_startup.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ALL_ROUTERS = "calculator,backtest,portfolio"
+
+# The eager baseline reproduces the old startup path: pandas imported by the
+# backtester and the database engine created while importing app.main
+EAGER_IMPORTS = "import pandas; import app.main; from app.database import engine"
+LAZY_IMPORTS = "import app.main"
+
+CONFIGURATIONS = {
+    "eager (old)": (ALL_ROUTERS, EAGER_IMPORTS),
+    "all routers": (ALL_ROUTERS, LAZY_IMPORTS),
+    "greeks only": ("calculator", LAZY_IMPORTS),
+}
+
+
+def time_startup(enabled_routers: str, imports: str) -> float:
+    """Return seconds spent running imports in a new interpreter"""
+    snippet = (
+        "import time; start = time.perf_counter(); "
+        f"{imports}; "
+        "print(time.perf_counter() - start)"
+    )
+    env = dict(os.environ, ENABLED_ROUTERS=enabled_routers)
+    result = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        # e.g. the eager baseline needs the Postgres driver installed
+        sys.exit(f"{imports!r} failed: {result.stderr.strip().splitlines()[-1]}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, (enabled_routers, imports) in CONFIGURATIONS.items():
+        timings = [time_startup(enabled_routers, imports) for _ in range(args.runs)]
+        print(
+            f"{label:<12} median {statistics.median(timings) * 1000:8.1f} ms"
+            f"  min {min(timings) * 1000:8.1f} ms  ({args.runs} runs)"
+        )
+
+
+if __name__ == "__main__":
+    main()